@@ -22,6 +22,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import time
+
 
 ################################################################################
 ########################## Drag And Drop Grid Sizer  ###########################
@@ -78,15 +80,37 @@ if __name__ == '__main__':
         """
         super().__init__(rows, cols, vgap, hgap)
         self.dragged_item = None
-        self.blank_item = wx.StaticText(parent, label="")
-        self.blank_item.Hide()
+        # Sizer item of the spacer standing in for the dragged item's slot
+        # while a drag is in progress
+        self.blank_item = None
         self.last_pos_screen = None
         self.mouse_offset_x = 0
         self.mouse_offset_y = 0
         self.scroll_speed = 20
         self.scroll_timer = wx.Timer(parent)
+        self._scroll_direction = (0, 0)
         self.containing_window = parent
         self.containing_window.Bind(wx.EVT_TIMER, self._OnScrollTimer, self.scroll_timer)
+        # Whether the container can auto-scroll; checked on every processed
+        # motion event, so resolved once here
+        self._can_scroll = isinstance(parent, wx.ScrolledWindow)
+        self._slot_windows = []
+        self._slot_rects = []
+        self._blank_index = -1
+        self._blank_rect = None
+        self._grid_cols = 0
+        self._cell_w = 0
+        self._cell_h = 0
+        self._grid_uniform = False
+        self._last_motion_ts = 0.0
+        self._layout_pending = False
+        self._drag_w = 0
+        self._drag_h = 0
+        self._client_w = 0
+        self._client_h = 0
+        self._win_origin = (0, 0)
+        self.containing_window.Bind(wx.EVT_SIZE, self._OnContainerSize)
+        wx.GetTopLevelParent(parent).Bind(wx.EVT_MOVE, self._OnFrameMove)
 
     def AddItem(self, item):
         """
@@ -114,16 +138,60 @@ if __name__ == '__main__':
         item = event.GetEventObject()
         item.CaptureMouse()
         self.dragged_item = item
-        
-        # Replace the item with a blank item to free up its slot
-        self.Replace(item, self.blank_item)
+
+        # Cache the sizes used by the bounds checks: they do not change
+        # during the drag, so they are queried once here instead of on
+        # every mouse event
+        self._drag_w, self._drag_h = item.GetSize()
+        self._client_w, self._client_h = self.containing_window.GetClientSize()
+        self._win_origin = self.containing_window.ClientToScreen((0, 0))
+
+        # Cache the screen rect of every slot for the duration of the drag,
+        # while every slot still holds a real window
+        self._RebuildSlotCache()
+
+        # Free up the item's slot: detach it and put a plain spacer of the
+        # same size in its place. Unlike a hidden window, a spacer takes no
+        # part in native layout or painting
+        for i, window in enumerate(self._slot_windows):
+            if window is item:
+                self.Detach(item)
+                self.blank_item = self.Insert(i, self._drag_w, self._drag_h)
+                self._slot_windows[i] = None
+                self._blank_index = i
+                self._blank_rect = self._slot_rects[i]
+                break
         self.Layout()
-        
-        # Calculate the offset between the item and the mouse cursor
-        self.last_pos_screen = wx.GetMousePosition()
-        self.mouse_offset_x, self.mouse_offset_y = self.dragged_item.ScreenToClient(
-            self.last_pos_screen)
-        
+
+        # Bring the dragged item to the front once for the whole drag;
+        # restacking on every slot change triggers needless native repaints
+        item.Raise()
+
+        # Capture the grid geometry. Slots in a regular grid share a single
+        # pitch, which allows hover lookups in constant time; check that the
+        # last slot is where the pitch predicts before relying on it.
+        self._grid_cols = self.GetEffectiveColsCount()
+        self._grid_uniform = False
+        if self._slot_rects and self._grid_cols > 0:
+            first_rect = self._slot_rects[0]
+            self._cell_w = first_rect.width + self.GetHGap()
+            self._cell_h = first_rect.height + self.GetVGap()
+            last = len(self._slot_rects) - 1
+            last_rect = self._slot_rects[last]
+            self._grid_uniform = (
+                self._cell_w > 0 and self._cell_h > 0
+                and last_rect.x == first_rect.x
+                    + (last % self._grid_cols) * self._cell_w
+                and last_rect.y == first_rect.y
+                    + (last // self._grid_cols) * self._cell_h)
+
+        # Calculate the offset between the item and the mouse cursor. The
+        # event position is already relative to the item, so it is exactly
+        # that offset
+        pos_item = event.GetPosition()
+        self.mouse_offset_x, self.mouse_offset_y = pos_item
+        self.last_pos_screen = item.ClientToScreen(pos_item)
+
         # Update the dragged item position
         self._UpdateDraggedItempPos(self.last_pos_screen)
 
@@ -136,8 +204,18 @@ if __name__ == '__main__':
         :param event: The mouse event
         """
         if self.dragged_item is not None and event.Dragging() and event.LeftIsDown():
-            pos_screen = wx.GetMousePosition()
-            
+            # Mouse events can arrive much faster than the display refreshes
+            # (high polling rate mice), so coalesce them to roughly 60fps.
+            # The final position is always committed in _OnMouseUp.
+            now = time.monotonic()
+            if now - self._last_motion_ts < 0.016:
+                return
+            self._last_motion_ts = now
+
+            # The event already carries the cursor position, so there is no
+            # need for a separate wx.GetMousePosition() query
+            pos_screen = event.GetEventObject().ClientToScreen(event.GetPosition())
+
             # Update the dragged item position
             self._UpdateDraggedItempPos(pos_screen)
 
@@ -150,54 +228,79 @@ if __name__ == '__main__':
         if self.dragged_item is not None:
             item = event.GetEventObject()
             item.ReleaseMouse()
-            
-            # Get mouse position on release
-            pos_screen = wx.GetMousePosition()
+
+            # Get mouse position on release from the event itself
+            pos_screen = item.ClientToScreen(event.GetPosition())
             
             # Find the closest item slot
             closest_index = self._FindClosestItemSlot(pos_screen)
-            
+
+            if self._blank_index != -1:
+                # Put the dragged item back into the slot freed by the spacer
+                self.Detach(self._blank_index)
+                self.Insert(self._blank_index, self.dragged_item, 0, 0)
+
             if closest_index != -1:
-                # Replace blank_item with dragged item
-                self.Replace(self.blank_item, self.dragged_item)
-                
                 # Move the dragged item to the closest position
-                closest_pos = self.GetItem(closest_index).GetWindow().GetScreenRect().GetPosition()
+                closest_pos = self._slot_rects[closest_index].GetPosition()
                 self.dragged_item.SetPosition(self.containing_window.ScreenToClient(closest_pos))
-            
+
             self.Layout()
             self.dragged_item = None
-            
+            self.blank_item = None
+            self._slot_windows = []
+            self._slot_rects = []
+            self._blank_index = -1
+            self._blank_rect = None
+
             # Stop the scroll timer
             self.scroll_timer.Stop()
 
+    def _OnContainerSize(self, event):
+        """
+        Callback for the containing window size event. Keeps the cached
+        client size up to date while the window is resized.
+
+        :param event: The size event
+        """
+        self._client_w, self._client_h = self.containing_window.GetClientSize()
+
+        # A resize is the one event (besides scrolling) that actually moves
+        # the slots, so the cached rects must be re-queried. The default
+        # handler has not laid the children out yet at this point, so the
+        # re-query is deferred until after it runs
+        if self.dragged_item is not None:
+            wx.CallAfter(self._RebuildSlotCache)
+        event.Skip()
+
+    def _OnFrameMove(self, event):
+        """
+        Callback for the top-level window move event. Keeps the cached
+        screen origin of the containing window up to date during a drag.
+
+        :param event: The move event
+        """
+        if self.dragged_item is not None:
+            self._win_origin = self.containing_window.ClientToScreen((0, 0))
+        event.Skip()
+
     def _OnScrollTimer(self, event):
         """
         Callback for the scroll timer event
-        
+
         The timer is used to periodically scroll the panel while a dragged item is
-        outside the visible area. This method also moves the dragged item to the
-        closest available slot after scrolling.
+        outside the visible area.
         """
         pos_screen = wx.GetMousePosition()
-        
-        # Update the dragged item position
+
+        # Scroll one step in the direction recorded by _StartScroll
+        self._Scroll(self._scroll_direction)
+
+        # Update the dragged item position. _UpdateItemSlotIfNeeded already
+        # lays the grid out again when the hovered slot actually changes, so
+        # no extra Layout() is needed here; Scroll() and the targeted
+        # RefreshRect take care of repainting
         self._UpdateDraggedItempPos(pos_screen)
-        
-        # Find the closest item slot
-        closest_index = self._FindClosestItemSlot(pos_screen)
-        
-        if closest_index != -1:
-            # Replace blank_item with dragged item
-            self.Replace(self.blank_item, self.dragged_item)
-            
-            # Move the dragged item to the closest position
-            closest_pos = self.GetItem(closest_index).GetWindow().GetScreenRect().GetPosition()
-            self.dragged_item.SetPosition(self.containing_window.ScreenToClient(closest_pos))
-        
-        # Refresh the layout
-        self.containing_window.Layout()
-        self.containing_window.Refresh()
 
 
     ############################################################################
@@ -213,13 +316,11 @@ if __name__ == '__main__':
         :param pos_screen: The current position of the mouse cursor
         :return: The new position of the dragged item
         """
-        # Calculate new item position based on mouse position
-        new_pos = (pos_screen[0] - self.mouse_offset_x, pos_screen[1] - self.mouse_offset_y)
-        
-        # Convert new position to be relative to the window
-        new_pos = self.containing_window.ScreenToClient(new_pos)
-        
-        return new_pos
+        # Converting to client coordinates is a pure translation by the
+        # window's screen origin, which is cached at drag start, so no
+        # native ScreenToClient call is needed here
+        return (pos_screen[0] - self.mouse_offset_x - self._win_origin[0],
+                pos_screen[1] - self.mouse_offset_y - self._win_origin[1])
 
     def _UpdateDraggedItempPos(self, pos_screen):
         """
@@ -232,22 +333,37 @@ if __name__ == '__main__':
         
         :param pos_screen: The current position of the mouse cursor
         """
+        # This runs for every processed mouse event, so the attributes used
+        # more than once are bound to locals
+        dragged_item = self.dragged_item
+        drag_w = self._drag_w
+        drag_h = self._drag_h
+
         # Calculate new item position based on mouse position
-        new_pos = self._CalculateNewPosition(pos_screen)
-        
-        # Move the item to the new position
-        self.dragged_item.SetPosition(new_pos)
-        
+        x, y = self._CalculateNewPosition(pos_screen)
+
+        # Move the item to the new position, then repaint only the area it
+        # left and the area it now covers instead of the whole client area
+        old_rect = dragged_item.GetRect()
+        dragged_item.SetPosition((x, y))
+        new_rect = wx.Rect(x, y, drag_w, drag_h)
+        self.containing_window.RefreshRect(old_rect.Union(new_rect),
+                                           eraseBackground=False)
+
         # Update the item slot if needed
         self._UpdateItemSlotIfNeeded(pos_screen)
-        
-        # Check if item is outside the panel and start scrolling 
-        if isinstance(self.containing_window, wx.ScrolledWindow) and \
-           (new_pos[0] < 0
-            or new_pos[0] + self.dragged_item.GetSize()[0] > self.containing_window.GetClientRect().width
-            or new_pos[1] < 0
-            or new_pos[1] + self.dragged_item.GetSize()[1] > self.containing_window.GetClientRect().height):
-            self._StartScroll()
+
+        # Check if item is outside the panel and start scrolling
+        if self._can_scroll:
+            if (x < 0
+                    or x + drag_w > self._client_w
+                    or y < 0
+                    or y + drag_h > self._client_h):
+                self._StartScroll()
+            elif self.scroll_timer.IsRunning():
+                # The item is back inside the visible area, so there is no
+                # reason to keep the timer ticking until the mouse release
+                self.scroll_timer.Stop()
 
 
     ############################################################################
@@ -261,22 +377,21 @@ if __name__ == '__main__':
         The timer is started to trigger periodic scrolling of the panel
         """
         item_pos = self.dragged_item.GetPosition()
-    
-        # Determine in which direction the item is outside the panel
-        direction = None
-        if item_pos[0] < 0:
-            direction = (-1, 0)
-        elif item_pos[0] + self.dragged_item.GetSize()[0] > self.containing_window.GetClientRect().width:
-            direction = (1, 0)
-        elif item_pos[1] < 0:
-            direction = (0, -1)
-        elif item_pos[1] + self.dragged_item.GetSize()[1] > self.containing_window.GetClientRect().height:
-            direction = (0, 1)
-
-        # If the item is outside the panel, start scrolling
-        if direction is not None:
-            self.scroll_timer.Start(100, wx.TIMER_CONTINUOUS)
-            self.containing_window.Bind(wx.EVT_TIMER, lambda evt: self._Scroll(direction), self.scroll_timer)
+
+        # Determine on which sides the item sticks out of the panel. The
+        # axes are computed independently, so dragging into a corner
+        # scrolls diagonally, and the booleans combine to -1, 0 or 1
+        # without branching
+        dx = (item_pos[0] + self._drag_w > self._client_w) - (item_pos[0] < 0)
+        dy = (item_pos[1] + self._drag_h > self._client_h) - (item_pos[1] < 0)
+
+        # If the item is outside the panel, record the direction and start
+        # the timer. The EVT_TIMER handler is bound once in __init__;
+        # re-binding here would stack a new handler on every edge crossing
+        if dx or dy:
+            self._scroll_direction = (dx, dy)
+            if not self.scroll_timer.IsRunning():
+                self.scroll_timer.Start(100, wx.TIMER_CONTINUOUS)
 
     def _Scroll(self, direction):
         """
@@ -292,40 +407,148 @@ if __name__ == '__main__':
             max(0, current_pos[1] + direction[1])
         )
         self.containing_window.Scroll(new_pos)
-        
-        # Move the item to the new position
-        self.dragged_item.SetPosition(self._CalculateNewPosition(self.last_pos_screen))
-        
+
         # Refresh the layout
         self.containing_window.Layout()
-        self.containing_window.Refresh()
+
+        # Scrolling moved every slot on screen, so the cache must be rebuilt
+        self._RebuildSlotCache()
 
     ############################################################################
     ##################### Methods for updating item slots ######################
     
     
+    def _RebuildSlotCache(self):
+        """
+        Rebuilds the cached slot windows and screen rects.
+
+        Querying the screen rect of a window is a native call, so it is done
+        here once per geometry change (drag start, scroll, resize) instead
+        of once per item on every mouse event. Reordering the children never
+        moves the slots themselves, so it updates the cached windows in
+        place and leaves the rects alone.
+
+        The index and rect of the blank spacer's slot are recorded along
+        the way, so motion events that stay inside it can bail out without
+        any lookup.
+        """
+        self._slot_windows = []
+        self._slot_rects = []
+        self._blank_index = -1
+        self._blank_rect = None
+        for i in range(self.GetItemCount()):
+            item = self.GetItem(i)
+            window = item.GetWindow()
+            if window is not None:
+                rect = window.GetScreenRect()
+            else:
+                # The blank spacer has no window; derive its screen rect
+                # from the sizer item itself
+                rect = wx.Rect(
+                    self.containing_window.ClientToScreen(item.GetPosition()),
+                    item.GetSize())
+                self._blank_index = i
+                self._blank_rect = rect
+            self._slot_windows.append(window)
+            self._slot_rects.append(rect)
+
+    def _FindHoveredSlot(self, pos_screen):
+        """
+        Finds the index of the slot that contains the given screen position.
+
+        Slots in a regular grid all share the same pitch, so the hovered
+        (row, col) is computed in constant time from the cursor position.
+        The linear scan only remains as a fallback for grids whose geometry
+        does not match the regular pitch (e.g. growable rows or columns).
+
+        :param pos_screen: The position to look up
+        :return: The index of the hovered slot, or -1 if the position is
+                 over no slot
+        """
+        if self._grid_uniform:
+            origin = self._slot_rects[0]
+            col = (pos_screen[0] - origin.x) // self._cell_w
+            row = (pos_screen[1] - origin.y) // self._cell_h
+            if col < 0 or col >= self._grid_cols or row < 0:
+                return -1
+            i = row * self._grid_cols + col
+            if i < len(self._slot_rects) \
+               and self._slot_rects[i].Contains(pos_screen):
+                return i
+            return -1
+
+        # Fallback: search every slot
+        for i, item_rect in enumerate(self._slot_rects):
+            if item_rect.Contains(pos_screen):
+                return i
+        return -1
+
     def _UpdateItemSlotIfNeeded(self, pos_screen):
         """
         Updates the item slot the the dragged item is hovering over. Happens
         only the first time the dragged item is hovering over it.
-        
+
         :param pos_screen: The current position of the mouse cursor
         """
+        # Common case: the cursor has moved by a few pixels but is still
+        # inside the slot the blank item already occupies
+        if self._blank_rect is not None and self._blank_rect.Contains(pos_screen):
+            return
+
         # Search for the item that is hovered on
-        for i in range(self.GetItemCount()):
-            item_rect = self.GetItem(i).GetWindow().GetScreenRect()
-            if item_rect.Contains(pos_screen):
-                # Detach the blank item and insert it at the current position
-                self.Detach(self.blank_item)
-                self.Insert(i, self.blank_item, 0, 0)
-                
-                # Bring the dragged item to the front
-                self.dragged_item.Raise()
-                
-                # Call Layout() to ensure the grid sizer displays the blank
-                # item moved to new slot
-                self.Layout()
-                break
+        i = self._FindHoveredSlot(pos_screen)
+        if i != -1:
+            # Walk the blank spacer to the hovered slot one swap at a time:
+            # only the windows sitting between the two slots are detached
+            # and re-inserted, instead of shifting the whole child list
+            # twice with a full Detach/Insert of the spacer
+            step = 1 if i > self._blank_index else -1
+            for k in range(self._blank_index, i, step):
+                neighbor = self.GetItem(k + step).GetWindow()
+                self.Detach(k + step)
+                self.Insert(k, neighbor, 0, 0)
+                self._slot_windows[k] = neighbor
+                self._slot_windows[k + step] = None
+
+            # The slot positions do not change when the items are reordered,
+            # so the blank item now occupies the cached rect at its new index
+            self._blank_index = i
+            self._blank_rect = self._slot_rects[i]
+
+            # Defer the layout so that several slot crossings within one
+            # event-loop turn share a single layout pass
+            self._RequestLayout()
+
+    def _RequestLayout(self):
+        """
+        Schedules a deferred layout of the grid. Consecutive slot changes
+        within one event-loop turn are coalesced into a single Layout()
+        call on the next turn.
+        """
+        if not self._layout_pending:
+            self._layout_pending = True
+            wx.CallAfter(self._DoDeferredLayout)
+
+    def _DoDeferredLayout(self):
+        """
+        Performs the layout requested by _RequestLayout. The slot caches
+        need no refresh here: reordering leaves the rects untouched and the
+        window mapping is kept up to date as the blank spacer moves.
+        """
+        self._layout_pending = False
+
+        # The drag may have ended before this ran; _OnMouseUp has already
+        # laid the grid out in that case
+        if self.dragged_item is None:
+            return
+
+        # Freeze the container so the reshuffle is painted once instead
+        # of once per sibling that changes slot
+        self.containing_window.Freeze()
+        try:
+            self.Layout()
+        finally:
+            self.containing_window.Thaw()
 
     def _FindClosestItemSlot(self, pos_screen):
         """
@@ -333,23 +556,37 @@ if __name__ == '__main__':
         Used to snap the dragged item to the nearest slot when the user releases
         the mouse.
         
+        On a regular grid the closest slot is found in constant time by
+        rounding the cursor position to the nearest cell on each axis. The
+        linear scan below is kept for non-uniform grids and for positions
+        past the ragged last row, where the per-axis rounding is not exact.
+
         :param pos_screen: The position to find the closest slot to
         :return: The index of the closest available slot, or -1 if no slot is available
         """
+        if self._grid_uniform:
+            origin = self._slot_rects[0]
+            max_row = (len(self._slot_rects) - 1) // self._grid_cols
+            col = (pos_screen[0] - origin.x + self._cell_w // 2) // self._cell_w
+            row = (pos_screen[1] - origin.y + self._cell_h // 2) // self._cell_h
+            col = min(max(col, 0), self._grid_cols - 1)
+            row = min(max(row, 0), max_row)
+            i = row * self._grid_cols + col
+            if i < len(self._slot_rects):
+                return i
+
         min_dist = float('inf')
         closest_index = -1
-        
-        # Search all the items in the grid (except the dragged item) to find
-        # the closest slot
-        for i in range(self.GetItemCount()):
-            item = self.GetItem(i).GetWindow()
-            if item != self.dragged_item:
-                item_rect = item.GetScreenRect()
-                dx = pos_screen[0] - item_rect.x
-                dy = pos_screen[1] - item_rect.y
-                dist = (dx**2 + dy**2)**0.5
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_index = i
+
+        # Search all the slots in the grid to find the closest one. Squared
+        # distances are compared: dropping the square root does not change
+        # which slot is the closest one.
+        for i, item_rect in enumerate(self._slot_rects):
+            dx = pos_screen[0] - item_rect.x
+            dy = pos_screen[1] - item_rect.y
+            dist = dx * dx + dy * dy
+            if dist < min_dist:
+                min_dist = dist
+                closest_index = i
         return closest_index
 